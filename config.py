@@ -29,6 +29,7 @@ FOV = 45
 NEAR_PLANE = 0.1
 FAR_PLANE = 50.0
 CAMERA_DISTANCE_MULTIPLIER = 5  # Multiplied by cube size for camera distance
+VSYNC = True  # Pace buffer swaps with the display refresh; the 60 fps timer stays as the cap
 
 # ============================================================================
 # INITIAL VIEW SETTINGS
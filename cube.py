@@ -2,12 +2,30 @@
 Main Rubik's Cube class that manages the collection of cubies, rotations, and rendering.
 """
 
+import functools
 import numpy as np
 import math
 from OpenGL.GL import *
 import config
-from cubie import Cubie
+from cubie import (Cubie, FACE_TABLE, FACE_NORMALS, FACE_QUADS, BORDER_QUADS, FACE_COLORS, INSIDE_COLOR,
+                   SELECTION_COLOR, SELECTION_INTERIOR_COLOR)
 from utils import logger
+from vertex_buffer import VertexBuffer, pack_vertices
+
+# Threshold for comparing logical positions, which are always multiples of 0.5
+EPSILON = 1e-6
+
+# Corner pairs forming the four edges of a quad, for GL_LINES
+QUAD_OUTLINE = np.array([0, 1, 1, 2, 2, 3, 3, 0])
+
+# Bit offsets of the R, G and B bytes of a picking face id
+PICK_SHIFTS = np.array([0, 8, 16])
+
+# Row of each face in FACE_NORMALS, by face name
+FACE_INDEX = {face_name: i for _, face_name, i in FACE_TABLE}
+
+# Column of each rotation axis in the positions array
+AXIS_INDEX = {'x': 0, 'y': 1, 'z': 2}
 
 class RubiksCube:
     """Manages the collection of cubies, rotations, and rendering."""
@@ -21,32 +39,85 @@ class RubiksCube:
         """
         self.n = n if n is not None else config.CUBE_SIZE
         
-        # Margin helps calculate coordinates from -X to +X
-        margin = (self.n - 1) / 2.0
+        # Distance from the center to the outer slices, used for every slice test
+        self.margin = (self.n - 1) / 2.0
+        
+        # Axis, slice and base direction of each face move
+        self.face_moves = {
+            'U': ('y', self.margin, 1),
+            'D': ('y', -self.margin, -1),
+            'R': ('x', self.margin, 1),
+            'L': ('x', -self.margin, -1),
+            'F': ('z', self.margin, 1),
+            'B': ('z', -self.margin, -1)
+        }
         
-        # Create the list of cubies in their initial positions
-        self.cubies = [Cubie((x, y, z), self.n)
-                       for x in np.linspace(-margin, margin, self.n)
-                       for y in np.linspace(-margin, margin, self.n)
-                       for z in np.linspace(-margin, margin, self.n)]
+        # Create the cubies in their initial positions
+        self._create_cubies()
 
         # Animation state
-        self.is_animating = False
-        self.animation_cubies = []
+        self._clear_animation()
         self.animation_axis = None
         self.animation_angle = 0
         self.animation_target_angle = 0
+        self.animation_step = 0
+        self.animation_step_angle = 0
+        self.animation_steps = 0
 
         # View rotation of the entire cube (controlled by user)
         self.view_rot_x = config.INITIAL_ROTATION_X
         self.view_rot_y = config.INITIAL_ROTATION_Y
+        self._view_key = None
+        self._view_matrix = None
+        
+        # GPU buffers for the static cubies and the moving slice, both
+        # re-uploaded only when the cube changes
+        self._static_faces = VertexBuffer()
+        self._static_borders = VertexBuffer()
+        self._moving_faces = VertexBuffer()
+        self._moving_borders = VertexBuffer()
+        self._pick_faces = VertexBuffer(GL_STREAM_DRAW)
+        
+        logger.info("🎲 %dx%d Rubik's Cube initialized", self.n, self.n)
+
+    def _create_cubies(self):
+        """Create the cubies along with the arrays holding their state."""
+        # Margin helps calculate coordinates from -X to +X
+        margin = self.margin
+        steps = np.linspace(-margin, margin, self.n)
+        
+        # One row per cubie: logical positions and transformation matrices
+        self.positions = np.stack(np.meshgrid(steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 3)
+        self.matrices = np.tile(np.identity(4), (len(self.positions), 1, 1))
+        self.matrices[:, :3, 3] = self.positions
         
-        logger.info(f"🎲 {self.n}x{self.n} Rubik's Cube initialized")
+        # Faces pointing out of the cube carry their sticker color, the rest are 'INSIDE'
+        self.exterior = np.abs(np.dot(self.positions, FACE_NORMALS.T) - margin) < EPSILON
+        self.face_colors = np.where(self.exterior[..., None], FACE_COLORS, INSIDE_COLOR)
+        
+        # Selection state
+        count = len(self.positions)
+        self.selected = np.zeros(count, dtype=bool)
+        self.adjacent = np.zeros(count, dtype=bool)
+        
+        self.cubies = [Cubie(self, i) for i in range(len(self.positions))]
+    
+    def _clear_animation(self):
+        """Mark no cubie as part of a move."""
+        self.is_animating = False
+        self.animation_indices = np.array([], dtype=int)
+        self.animation_mask = np.zeros(len(self.cubies), dtype=bool)
+        self._batches_dirty = True
 
-    def get_rotation_matrix(self, angle, axis):
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def get_rotation_matrix(angle, axis):
         """
         Generate a 4x4 rotation matrix for OpenGL.
         
+        Animation angles advance in fixed steps, so results are cached and the
+        returned array is read-only.
+        
         Args:
             angle (float): Rotation angle in degrees
             axis (str): Rotation axis ('x', 'y', 'z')
@@ -56,13 +127,61 @@ class RubiksCube:
         """
         c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
         if axis == 'x': 
-            return np.array([[1, 0, 0, 0], [0, c,-s, 0], [0, s, c, 0], [0, 0, 0, 1]], dtype=float)
-        if axis == 'y': 
-            return np.array([[c, 0, s, 0], [0, 1, 0, 0], [-s,0, c, 0], [0, 0, 0, 1]], dtype=float)
-        if axis == 'z': 
-            return np.array([[c,-s, 0, 0], [s, c, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=float)
-        # For safety, if axis is None (during animation), return identity matrix
-        return np.identity(4)
+            matrix = np.array([[1, 0, 0, 0], [0, c,-s, 0], [0, s, c, 0], [0, 0, 0, 1]], dtype=float)
+        elif axis == 'y': 
+            matrix = np.array([[c, 0, s, 0], [0, 1, 0, 0], [-s,0, c, 0], [0, 0, 0, 1]], dtype=float)
+        elif axis == 'z': 
+            matrix = np.array([[c,-s, 0, 0], [s, c, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=float)
+        else:
+            # For safety, if axis is None (during animation), return identity matrix
+            matrix = np.identity(4)
+        matrix.setflags(write=False)
+        return matrix
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def get_gl_rotation_matrix(angle, axis):
+        """
+        Get a rotation matrix laid out for glMultMatrixf.
+        
+        OpenGL reads matrices as column-major float32, so the transposed copy
+        is made once per (angle, axis) here rather than on every call.
+        
+        Args:
+            angle (float): Rotation angle in degrees
+            axis (str): Rotation axis ('x', 'y', 'z')
+            
+        Returns:
+            numpy.ndarray: Read-only contiguous float32 4x4 matrix
+        """
+        matrix = np.ascontiguousarray(RubiksCube.get_rotation_matrix(angle, axis).T, dtype=np.float32)
+        matrix.setflags(write=False)
+        return matrix
+
+    def get_view_matrix(self):
+        """
+        Get the camera matrix for the current view rotation.
+        
+        The matrix is only rebuilt when the view rotation changes.
+        
+        Returns:
+            numpy.ndarray: 4x4 modelview matrix (row-major, transpose for OpenGL)
+        """
+        key = (self.view_rot_x, self.view_rot_y)
+        if key != self._view_key:
+            # Rx(view_rot_x) @ Ry(view_rot_y), written out directly; drag
+            # angles are arbitrary floats, so caching per angle would not pay
+            cx, sx = math.cos(math.radians(self.view_rot_x)), math.sin(math.radians(self.view_rot_x))
+            cy, sy = math.cos(math.radians(self.view_rot_y)), math.sin(math.radians(self.view_rot_y))
+            view = np.array([
+                [cy, 0.0, sy, 0.0],
+                [sx*sy, cx, -sx*cy, 0.0],
+                [-cx*sy, sx, cx*cy, -config.CAMERA_DISTANCE_MULTIPLIER * self.n],
+                [0.0, 0.0, 0.0, 1.0]
+            ])
+            self._view_matrix = view
+            self._view_key = key
+        return self._view_matrix
 
     def start_move(self, axis, slice_index, direction):
         """
@@ -81,75 +200,189 @@ class RubiksCube:
         self.animation_target_angle = 90 * direction
         self.animation_angle = 0
         
-        # Select cubies that belong to the slice to rotate
-        axis_map = {'x': 0, 'y': 1, 'z': 2}
-        
-        epsilon = 1e-6  # Use threshold for floating point comparison
+        # Count frames as integer ticks so the angle never drifts; the
+        # signed angle per tick is fixed for the whole move
+        self.animation_step = 0
+        self.animation_step_angle = direction * config.ANIMATION_SPEED
+        self.animation_steps = max(1, math.ceil(90 / config.ANIMATION_SPEED))
         
-        self.animation_cubies = [c for c in self.cubies if abs(c.pos[axis_map[axis]] - slice_index) < epsilon]
+        # Select cubies that belong to the slice to rotate
+        self.animation_mask = np.abs(self.positions[:, AXIS_INDEX[axis]] - slice_index) < EPSILON
+        self.animation_indices = np.flatnonzero(self.animation_mask)
+        self._batches_dirty = True
         
-        logger.debug(f"🔄 Starting move: axis={axis}, slice={slice_index}, direction={direction}")
+        logger.debug("🔄 Starting move: axis=%s, slice=%s, direction=%s", axis, slice_index, direction)
 
     def update_animation(self):
         """Advance animation one step and finish if target is reached."""
         if not self.is_animating: 
             return
 
-        # Advance the angle
-        self.animation_angle += config.ANIMATION_SPEED * np.sign(self.animation_target_angle)
+        # Advance one tick
+        self.animation_step += 1
         
-        # If we've reached or passed the target angle, finish
-        if abs(self.animation_angle) >= abs(self.animation_target_angle):
+        # Finish on the last tick, otherwise derive the angle from the tick count
+        if self.animation_step >= self.animation_steps:
             self.animation_angle = self.animation_target_angle
             self.finish_move()
+        else:
+            self.animation_angle = self.animation_step * self.animation_step_angle
 
     def finish_move(self):
         """Finish animation by updating matrices and logical positions of cubies."""
         rot_matrix = self.get_rotation_matrix(self.animation_target_angle, self.animation_axis)
+        idx = self.animation_indices
         
-        for cubie in self.animation_cubies:
-            # 1. Update permanent transformation matrix
-            cubie.matrix = np.dot(rot_matrix, cubie.matrix)
-            # 2. Update logical position for future rotations
-            new_pos = np.dot(rot_matrix[:3, :3], cubie.pos)
-            
-            # Robust solution for all N:
-            steps = np.linspace(-(self.n-1)/2, (self.n-1)/2, self.n)
-            cubie.pos = np.array([
-                steps[np.argmin(np.abs(steps - new_pos[0]))],
-                steps[np.argmin(np.abs(steps - new_pos[1]))],
-                steps[np.argmin(np.abs(steps - new_pos[2]))]
-            ])
+        # 1. Update permanent transformation matrices of the whole slice
+        self.matrices[idx] = np.einsum('ij,kjl->kil', rot_matrix, self.matrices[idx])
+        # 2. Update logical positions for future rotations
+        new_pos = np.dot(self.positions[idx], rot_matrix[:3, :3].T)
+        
+        # Snap back onto the grid; works for all N since pos + margin is integral
+        self.positions[idx] = np.round(new_pos + self.margin) - self.margin
         
         # Reset animation state
-        self.is_animating = False
-        self.animation_cubies = []
+        self._clear_animation()
         
         logger.debug("✅ Move finished")
 
     def draw(self):
-        """Draw the entire cube, applying animations if necessary."""
-        glEnable(GL_DEPTH_TEST)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        
-        # Camera positioning and rotation
-        glTranslatef(0, 0, -config.CAMERA_DISTANCE_MULTIPLIER * self.n)
-        glRotatef(self.view_rot_x, 1, 0, 0)
-        glRotatef(self.view_rot_y, 0, 1, 0)
+        """
+        Draw the entire cube, applying animations if necessary.
         
+        The caller clears the frame and loads the view matrix (see
+        get_view_matrix) into the modelview stack first.
+        """
         self.update_animation()
 
-        # Temporary animation matrix that will be applied to moving cubies
-        anim_matrix = self.get_rotation_matrix(self.animation_angle, self.animation_axis) if self.is_animating else None
-        
-        for cubie in self.cubies:
-            # If cubie is part of current animation, pass temporary matrix
-            if cubie in self.animation_cubies:
-                cubie.draw(anim_matrix)
-            else:
-                cubie.draw()
+        # Cubie geometry only changes when a move starts or ends or the
+        # selection changes, so both batches stay on the GPU until then
+        if self._batches_dirty:
+            self._upload_batch(np.flatnonzero(~self.animation_mask), self._static_faces, self._static_borders)
+            self._upload_batch(self.animation_indices, self._moving_faces, self._moving_borders, True)
+            self._batches_dirty = False
+        self._static_faces.draw(GL_QUADS)
+        self._static_borders.draw(GL_LINES)
+        
+        # The moving slice is turned by the animation matrix on the GPU
+        if self.is_animating:
+            glPushMatrix()
+            glMultMatrixf(self.get_gl_rotation_matrix(self.animation_angle, self.animation_axis))
+            self._moving_faces.draw(GL_QUADS)
+            self._moving_borders.draw(GL_LINES)
+            glPopMatrix()
+    
+    def draw_pick(self):
+        """
+        Draw every cubie face in a flat color encoding its identity.
+        
+        Reading back the color under the cursor and passing it to
+        decode_pick_color gives the cubie and face drawn there. As with draw,
+        the caller clears the target and loads the view matrix first.
+        """
+        # Place the moving slice where it is currently shown
+        matrices = self.matrices
+        if self.is_animating:
+            matrices = matrices.copy()
+            matrices[self.animation_indices] = np.matmul(
+                self.get_rotation_matrix(self.animation_angle, self.animation_axis),
+                matrices[self.animation_indices])
+        vertices = np.einsum('nij,fvj->nfvi', matrices[:, :3, :3], FACE_QUADS) + matrices[:, None, None, :3, 3]
+        
+        # Face ids start at 1 so that the cleared background decodes to nothing
+        ids = np.arange(1, len(matrices) * 6 + 1).reshape(-1, 6, 1, 1)
+        colors = ((ids >> PICK_SHIFTS) & 0xff) / 255.0
+        self._pick_faces.upload(pack_vertices(vertices, 0.0, colors))
+        self._pick_faces.draw(GL_QUADS)
+    
+    def decode_pick_color(self, color):
+        """
+        Find the cubie face that draw_pick drew in the given color.
+        
+        Args:
+            color: (r, g, b) bytes read back from the picking render
+            
+        Returns:
+            tuple: (cubie, face) with the name of the cube face the clicked
+                sticker points to, or None for the background and interior faces
+        """
+        face_id = int(color[0]) | int(color[1]) << 8 | int(color[2]) << 16
+        if face_id == 0 or face_id > len(self.cubies) * 6:
+            return None
+        
+        cubie_index, face_index = divmod(face_id - 1, 6)
+        if not self.exterior[cubie_index, face_index]:
+            return None
+        
+        # The sticker's current direction names the cube face it lies on
+        normal = np.dot(self.matrices[cubie_index, :3, :3], FACE_NORMALS[face_index])
+        return self.cubies[cubie_index], config.FACES[tuple(int(round(c)) for c in normal)]
+    
+    def _upload_batch(self, indices, faces_buffer, borders_buffer, is_animating=False):
+        """
+        Build the geometry of a group of cubies and upload it for drawing.
+        
+        Args:
+            indices: Indices of the cubies in the group
+            faces_buffer (VertexBuffer): Buffer receiving the face quads
+            borders_buffer (VertexBuffer): Buffer receiving the border lines
+            is_animating (bool): Whether the cubies belong to the moving slice
+        """
+        faces_buffer.clear()
+        borders_buffer.clear()
+        if len(indices) == 0:
+            return
+        
+        matrices = self.matrices[indices]
+        rotations = matrices[:, :3, :3]
+        translations = matrices[:, :3, 3]
+        
+        # Transform the shared face geometry by every cubie matrix at once
+        vertices = np.einsum('nij,fvj->nfvi', rotations, FACE_QUADS) + translations[:, None, None, :]
+        normals = np.einsum('nij,fj->nfi', rotations, FACE_NORMALS)
+        colors, bordered = self._get_highlighting(indices, is_animating)
+        
+        faces = pack_vertices(vertices, normals[:, :, None, :], colors[:, :, None, :])
+        faces_buffer.upload(faces)
+        
+        # Borders for selection highlighting or animating cubies (all gold)
+        cubie_idx, face_idx = np.nonzero(bordered)
+        if len(cubie_idx):
+            corners = (np.einsum('kij,kvj->kvi', rotations[cubie_idx], BORDER_QUADS[face_idx])
+                       + translations[cubie_idx, None, :])
+            
+            # Each face outline becomes four line segments sharing its corners
+            lines = pack_vertices(corners, 0.0, SELECTION_COLOR)
+            indices = (4 * np.arange(len(cubie_idx))[:, None] + QUAD_OUTLINE).ravel()
+            borders_buffer.upload(lines, indices)
+    
+    def _get_highlighting(self, indices, is_animating=False):
+        """
+        Get the display colors and selection borders of a group of cubies.
+        
+        Selected and animating cubies get brighter stickers and a lit interior;
+        their sticker faces, and those of adjacent cubies, get a gold border.
+        
+        Args:
+            indices: Indices of the cubies in the group
+            is_animating (bool): Whether the cubies belong to the moving slice
+            
+        Returns:
+            tuple: (n, 6, 3) face colors and (n, 6) mask of bordered faces
+        """
+        colors = self.face_colors[indices]
+        exterior = self.exterior[indices]
+        if is_animating:
+            highlighted = bordered = np.ones(len(indices), dtype=bool)
+        else:
+            highlighted = self.selected[indices]
+            bordered = highlighted | self.adjacent[indices]
+        
+        highlight_colors = np.where(exterior[..., None],
+                                    np.minimum(1.0, colors * config.SELECTION_BRIGHTNESS_MULTIPLIER),
+                                    SELECTION_INTERIOR_COLOR)
+        colors = np.where(highlighted[:, None, None], highlight_colors, colors)
+        return colors, exterior & bordered[:, None]
     
     def reset_to_solved(self):
         """Reset the cube to solved state."""
@@ -158,11 +391,9 @@ class RubiksCube:
             self._clear_face_selection(self.selected_face)
             self.selected_face = None
         
-        margin = (self.n - 1) / 2.0
-        self.cubies = [Cubie((x, y, z), self.n)
-                       for x in np.linspace(-margin, margin, self.n)
-                       for y in np.linspace(-margin, margin, self.n)
-                       for z in np.linspace(-margin, margin, self.n)]
+        # Recreate the cubies, dropping any move in progress
+        self._create_cubies()
+        self._clear_animation()
         
         # Reset view rotation
         self.view_rot_x = config.INITIAL_ROTATION_X
@@ -178,128 +409,39 @@ class RubiksCube:
         
         # Set new selection
         self.selected_face = face
+        self._batches_dirty = True
         if face:
             self._set_face_selection(face)
-            logger.debug(f"Face selection set to: {face}")
+            logger.debug("Face selection set to: %s", face)
         else:
             logger.debug("Face selection cleared")
     
     def _clear_face_selection(self, face):
         """Clear selection for a face."""
-        # Find all cubies that belong to the selected face
-        face_cubies = self._get_cubies_for_face(face)
-        
-        for cubie in face_cubies:
-            cubie.set_selected(False)
-        
-        # Clear adjacent cubies
-        adjacent_cubies = self._get_adjacent_cubies_for_face(face)
-        for cubie in adjacent_cubies:
-            cubie.set_adjacent(False)
+        self.selected[self._get_face_mask(face)] = False
+        self.adjacent[self._get_adjacent_mask(face)] = False
     
     def _set_face_selection(self, face):
         """Set selection for a face."""
-        # Find all cubies that belong to the selected face
-        face_cubies = self._get_cubies_for_face(face)
-        
-        for cubie in face_cubies:
-            cubie.set_selected(True)
-        
-        # Set adjacent cubies
-        adjacent_cubies = self._get_adjacent_cubies_for_face(face)
-        for cubie in adjacent_cubies:
-            cubie.set_adjacent(True)
+        self.selected[self._get_face_mask(face)] = True
+        self.adjacent[self._get_adjacent_mask(face)] = True
     
-    def _get_cubies_for_face(self, face):
-        """Get all cubies that belong to a specific face."""
-        face_cubies = []
-        boundary = (self.n - 1) / 2.0
-        epsilon = 1e-6
-        
-        for cubie in self.cubies:
-            # Check if cubie belongs to the selected face
-            if face == 'U' and abs(cubie.pos[1] - boundary) < epsilon:
-                face_cubies.append(cubie)
-            elif face == 'D' and abs(cubie.pos[1] + boundary) < epsilon:
-                face_cubies.append(cubie)
-            elif face == 'R' and abs(cubie.pos[0] - boundary) < epsilon:
-                face_cubies.append(cubie)
-            elif face == 'L' and abs(cubie.pos[0] + boundary) < epsilon:
-                face_cubies.append(cubie)
-            elif face == 'F' and abs(cubie.pos[2] - boundary) < epsilon:
-                face_cubies.append(cubie)
-            elif face == 'B' and abs(cubie.pos[2] + boundary) < epsilon:
-                face_cubies.append(cubie)
-        
-        return face_cubies
+    def _get_face_mask(self, face):
+        """Get a mask of the cubies that belong to a specific face."""
+        if face not in FACE_INDEX:
+            return np.zeros(len(self.cubies), dtype=bool)
+        normal = FACE_NORMALS[FACE_INDEX[face]]
+        return np.abs(np.dot(self.positions, normal) - self.margin) < EPSILON
     
-    def _get_adjacent_cubies_for_face(self, face):
-        """Get cubies from adjacent faces that will move during rotation."""
-        adjacent_cubies = []
-        boundary = (self.n - 1) / 2.0
-        epsilon = 1e-6
-        
-        if face == 'F':  # Front face
-            # Top row of U face
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] - boundary) < epsilon and abs(cubie.pos[2] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Left column of R face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] - boundary) < epsilon and abs(cubie.pos[2] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Bottom row of D face
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] + boundary) < epsilon and abs(cubie.pos[2] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Right column of L face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] + boundary) < epsilon and abs(cubie.pos[2] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        elif face == 'U':  # Up face
-            # Top row of F, L, B, R faces
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        elif face == 'D':  # Down face
-            # Bottom row of F, L, B, R faces
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        elif face == 'L':  # Left face
-            # Left column of U, F, D faces and right column of B face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        elif face == 'R':  # Right face
-            # Right column of U, F, D faces and left column of B face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] - boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        elif face == 'B':  # Back face
-            # Top row of U face
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] - boundary) < epsilon and abs(cubie.pos[2] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Right column of R face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] - boundary) < epsilon and abs(cubie.pos[2] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Bottom row of D face
-            for cubie in self.cubies:
-                if abs(cubie.pos[1] + boundary) < epsilon and abs(cubie.pos[2] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-            # Left column of L face
-            for cubie in self.cubies:
-                if abs(cubie.pos[0] + boundary) < epsilon and abs(cubie.pos[2] + boundary) < epsilon:
-                    adjacent_cubies.append(cubie)
-        
-        return adjacent_cubies
+    def _get_adjacent_mask(self, face):
+        """Get a mask of the cubies from adjacent faces that will move during rotation."""
+        face_mask = self._get_face_mask(face)
+        if face in ('F', 'B'):
+            # Only the outer ring: the edges shared with the U, R, D and L faces
+            on_side = np.abs(np.abs(self.positions[:, :2]) - self.margin) < EPSILON
+            return face_mask & on_side.any(axis=1)
+        # For U, D, L and R the whole layer turns
+        return face_mask
     
     def rotate_face(self, face, direction):
         """
@@ -309,30 +451,15 @@ class RubiksCube:
             face (str): Face to rotate ('U', 'D', 'F', 'B', 'L', 'R')
             direction (int): Rotation direction (1 or -1)
         """
-        # Convert face name to axis and slice information
-        face_to_axis = {
-            'U': ('y', (self.n - 1) / 2.0, 1),
-            'D': ('y', -(self.n - 1) / 2.0, -1),
-            'R': ('x', (self.n - 1) / 2.0, 1),
-            'L': ('x', -(self.n - 1) / 2.0, -1),
-            'F': ('z', (self.n - 1) / 2.0, 1),
-            'B': ('z', -(self.n - 1) / 2.0, -1)
-        }
-        
-        if face in face_to_axis:
-            axis, slice_idx, base_dir = face_to_axis[face]
+        if face in self.face_moves:
+            axis, slice_idx, base_dir = self.face_moves[face]
             # Apply the rotation
             self.start_move(axis, slice_idx, direction * base_dir)
             
-            # Log the rotation with proper direction
-            actual_direction = direction * base_dir
-            if base_dir > 0:  # U, R, F faces
-                rotation_direction = "counterclockwise" if actual_direction > 0 else "clockwise"
-            else:  # L, D, B faces
-                rotation_direction = "clockwise" if actual_direction > 0 else "counterclockwise"
-            
-            logger.info(f"🔄 Rotating {face} face {rotation_direction}")
+            # Positive directions are counterclockwise seen from outside the face
+            rotation_direction = "counterclockwise" if direction > 0 else "clockwise"
+            logger.info("🔄 Rotating %s face %s", face, rotation_direction)
         else:
-            logger.warning(f"⚠️ Unknown face: {face}")
+            logger.warning("⚠️ Unknown face: %s", face)
     
  
\ No newline at end of file
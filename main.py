@@ -3,6 +3,15 @@ Main entry point for the Rubik's Cube application.
 """
 
 import sys
+import OpenGL
+
+# Under python -O, skip PyOpenGL's glGetError check after every call. The
+# flags are read when OpenGL.GL is first imported, so set them before the
+# cube and renderer modules pull it in
+if not __debug__:
+    OpenGL.ERROR_CHECKING = False
+    OpenGL.ERROR_LOGGING = False
+
 import config
 from cube import RubiksCube
 from renderer import Renderer
@@ -16,9 +25,9 @@ def main():
     # Initialize cube
     try:
         cube = RubiksCube()  # Uses config.CUBE_SIZE
-        logger.info(f"✓ {config.CUBE_SIZE}x{config.CUBE_SIZE} Rubik's Cube initialized")
+        logger.info("✓ %dx%d Rubik's Cube initialized", config.CUBE_SIZE, config.CUBE_SIZE)
     except Exception as e:
-        logger.error(f"❌ Failed to initialize cube: {e}")
+        logger.error("❌ Failed to initialize cube: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -29,7 +38,7 @@ def main():
         renderer.initialize()
         logger.info("✓ Renderer initialized")
     except Exception as e:
-        logger.error(f"❌ Failed to initialize renderer: {e}")
+        logger.error("❌ Failed to initialize renderer: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -58,7 +67,7 @@ def main():
     except KeyboardInterrupt:
         logger.warning("⚠️ Interrupted by user (Ctrl+C)")
     except Exception as e:
-        logger.error(f"❌ Error in game loop: {e}")
+        logger.error("❌ Error in game loop: %s", e)
         import traceback
         traceback.print_exc()
         return 1
@@ -5,11 +5,38 @@ Renderer class for handling OpenGL rendering and Pygame events.
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
-from OpenGL.GLU import *
 import numpy as np
 import config
 from cube import RubiksCube
-from utils import logger
+from utils import logger, perspective_matrix
+from vertex_buffer import enable_vertex_arrays
+
+# Event types processed by Renderer.handle_events
+HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                  pygame.VIDEOEXPOSE]
+
+# Longest time an idle frame blocks waiting for input, in milliseconds
+IDLE_EVENT_TIMEOUT = 100
+
+# Map pygame keys to our movement keys
+KEY_TO_MOVEMENT = {
+    pygame.K_UP: 'UP',
+    pygame.K_DOWN: 'DOWN',
+    pygame.K_RIGHT: 'RIGHT',
+    pygame.K_LEFT: 'LEFT',
+    pygame.K_f: 'FRONT',  # Keep F for front face
+    pygame.K_b: 'BACK'    # Keep B for back face
+}
+
+# Face turned by each movement key
+MOVEMENT_TO_FACE = {
+    'UP': 'U',
+    'DOWN': 'D',
+    'RIGHT': 'R',
+    'LEFT': 'L',
+    'FRONT': 'F',
+    'BACK': 'B'
+}
 
 class Renderer:
     """Handles OpenGL rendering and Pygame event processing."""
@@ -17,7 +44,18 @@ class Renderer:
     def __init__(self):
         """Initialize the renderer."""
         self.initialized = False
+        self.viewport = None
+        self.projection = None
+        self.pick_framebuffer = None
         self.clock = pygame.time.Clock()
+        self.key_mappings = config.get_key_mappings()
+        
+        # Handler of every key that does something, called with (event, cube)
+        self.keydown_handlers = {pygame.K_r: self._handle_reset_key, pygame.K_d: self._handle_debug_key}
+        self.keydown_handlers.update(dict.fromkeys(KEY_TO_MOVEMENT, self._handle_movement_key))
+        
+        # Frames are only drawn when something on screen may have changed
+        self.needs_redraw = True
         
         # Mouse interaction variables
         self.mouse_down = False
@@ -28,18 +66,47 @@ class Renderer:
         self.face_rotation_drag = False
         self.face_rotation_start_pos = None
         self.face_rotation_threshold = 30  # pixels
+        self.face_rotation_threshold_sq = self.face_rotation_threshold ** 2
         self.face_rotation_triggered = False
     
     def initialize(self):
         """Initialize Pygame and OpenGL."""
         pygame.init()
         display = (config.WINDOW_WIDTH, config.WINDOW_HEIGHT)
-        pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+        try:
+            pygame.display.set_mode(display, DOUBLEBUF | OPENGL, vsync=int(config.VSYNC))
+        except pygame.error:
+            logger.warning("⚠️ VSync not available")
+            pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+        
+        # Only queue the events handle_events uses, so SDL drops the rest
+        # before they are converted to Python objects
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(HANDLED_EVENTS)
+        
         pygame.display.set_caption(f"Rubik's Cube {config.CUBE_SIZE}x{config.CUBE_SIZE} | Controls: Arrows,F,B (+Shift) | Right-click to select faces")
 
         # Set up OpenGL perspective
+        self.viewport = (0, 0, display[0], display[1])
+        self.projection = perspective_matrix(config.FOV, display[0] / display[1], config.NEAR_PLANE, config.FAR_PLANE)
         glMatrixMode(GL_PROJECTION)
-        gluPerspective(config.FOV, (display[0] / display[1]), config.NEAR_PLANE, config.FAR_PLANE)
+        glLoadMatrixf(self.projection.T)
+        
+        # Nothing else touches the projection, so the modelview stack stays
+        # current for the rest of the program
+        glMatrixMode(GL_MODELVIEW)
+        
+        # Fixed render state, set once rather than every frame
+        glEnable(GL_DEPTH_TEST)
+        enable_vertex_arrays()
+        
+        # Cubies are closed boxes with counter-clockwise faces, so faces turned
+        # away from the camera are always hidden and can be skipped
+        glEnable(GL_CULL_FACE)
+        glCullFace(GL_BACK)
+        glFrontFace(GL_CCW)
+        
+        self.pick_framebuffer = self._create_pick_framebuffer(display)
         
         self.initialized = True
         logger.info("🎮 Renderer initialized")
@@ -54,24 +121,36 @@ class Renderer:
         Returns:
             bool: True if application should continue running, False to quit
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                elif event.key == pygame.K_r:
-                    cube.reset_to_solved()
-                    logger.info("✅ Cube reset")
-                elif event.key == pygame.K_d:
-                    logger.toggle_debug()
+        # Only handled event types are queued (see HANDLED_EVENTS), and they
+        # are tested most frequent first
+        events = pygame.event.get()
+        
+        # With nothing to draw, sleep until input arrives instead of polling
+        if not events and not self.needs_redraw and not cube.is_animating:
+            event = pygame.event.wait(IDLE_EVENT_TIMEOUT)
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        
+        for i, event in enumerate(events):
+            event_type = event.type
+            if event_type == pygame.MOUSEMOTION:
+                # Only the last of consecutive motion events matters, since
+                # both drag handlers work from the latest position
+                if i + 1 < len(events) and events[i + 1].type == pygame.MOUSEMOTION:
+                    continue
+                if not self.mouse_down:
+                    continue
+                
+                self.needs_redraw = True
+                if self.face_rotation_drag and self.selected_face:
+                    # Handle face rotation
+                    self._handle_face_rotation(event.pos, cube)
                 else:
-                    # Handle cube movement keys
-                    self._handle_movement_key(event, cube)
+                    # Handle cube rotation
+                    self._handle_mouse_motion(event.pos, cube)
             
-            # Handle mouse controls
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            elif event_type == pygame.MOUSEBUTTONDOWN:
+                self.needs_redraw = True
                 if event.button == 1:  # Left mouse button
                     self.mouse_down = True
                     self.last_mouse_pos = event.pos
@@ -80,7 +159,7 @@ class Renderer:
                     if self.selected_face:
                         self.face_rotation_drag = True
                         self.face_rotation_start_pos = event.pos
-                        logger.info(f"🔄 Started face rotation for {self.selected_face}")
+                        logger.info("🔄 Started face rotation for %s", self.selected_face)
                 elif event.button == 3:  # Right mouse button - face selection
                     # Check if we clicked on a specific cubie
                     clicked_cubie_info = self.get_clicked_cubie_info(event.pos, cube)
@@ -88,31 +167,60 @@ class Renderer:
                         cubie, face = clicked_cubie_info
                         self.selected_face = face
                         cube.set_selected_face(face)
-                        logger.info(f"🎯 Selected face: {face}")
-                        logger.debug(f"Cubie position: {cubie.pos}")
+                        logger.info("🎯 Selected face: %s", face)
+                        logger.debug("Cubie position: %s", cubie.pos)
                     else:
                         self.selected_face = None
                         cube.set_selected_face(None)
                         logger.info("❌ No face selected")
             
-            if event.type == pygame.MOUSEBUTTONUP:
+            elif event_type == pygame.MOUSEBUTTONUP:
+                self.needs_redraw = True
                 if event.button == 1:  # Left mouse button
                     self.mouse_down = False
                     if self.face_rotation_drag:
                         self.face_rotation_drag = False
                         self.face_rotation_triggered = False  # Reset for next rotation
-                        logger.info(f"✅ Finished face rotation for {self.selected_face}")
+                        logger.info("✅ Finished face rotation for %s", self.selected_face)
             
-            if event.type == pygame.MOUSEMOTION and self.mouse_down:
-                if self.face_rotation_drag and self.selected_face:
-                    # Handle face rotation
-                    self._handle_face_rotation(event.pos, cube)
-                else:
-                    # Handle cube rotation
-                    self._handle_mouse_motion(event.pos, cube)
+            elif event_type == pygame.KEYDOWN:
+                self.needs_redraw = True
+                if event.key == pygame.K_ESCAPE:
+                    return False
+                handler = self.keydown_handlers.get(event.key)
+                if handler:
+                    handler(event, cube)
+            
+            elif event_type == pygame.QUIT:
+                return False
+            
+            else:
+                # Expose event: the window contents were lost
+                self.needs_redraw = True
         
         return True
     
+    def _handle_reset_key(self, event, cube):
+        """
+        Reset the cube to its solved state.
+        
+        Args:
+            event: Pygame key event
+            cube (RubiksCube): The cube instance
+        """
+        cube.reset_to_solved()
+        logger.info("✅ Cube reset")
+    
+    def _handle_debug_key(self, event, cube):
+        """
+        Toggle debug logging.
+        
+        Args:
+            event: Pygame key event
+            cube (RubiksCube): The cube instance
+        """
+        logger.toggle_debug()
+    
     def _handle_movement_key(self, event, cube):
         """
         Handle movement key presses.
@@ -121,39 +229,18 @@ class Renderer:
             event: Pygame key event
             cube (RubiksCube): The cube instance
         """
-        key_mappings = config.get_key_mappings()
-        
-        # Map pygame keys to our movement keys
-        pygame_to_movement = {
-            pygame.K_UP: 'UP',
-            pygame.K_DOWN: 'DOWN', 
-            pygame.K_RIGHT: 'RIGHT',
-            pygame.K_LEFT: 'LEFT',
-            pygame.K_f: 'FRONT',  # Keep F for front face
-            pygame.K_b: 'BACK'    # Keep B for back face
-        }
-        
-        if event.key in pygame_to_movement:
-            movement_key = pygame_to_movement[event.key]
-            if movement_key in key_mappings:
-                mods = pygame.key.get_mods()
-                direction = 1 if mods & pygame.KMOD_SHIFT else -1
-                
-                # Convert movement key to face name
-                face_names = {
-                    'UP': 'U',
-                    'DOWN': 'D', 
-                    'RIGHT': 'R',
-                    'LEFT': 'L',
-                    'FRONT': 'F',
-                    'BACK': 'B'
-                }
-                face = face_names.get(movement_key, movement_key)
-                
-                # Use the cube's rotate_face method directly
-                cube.rotate_face(face, direction)
-                
-                logger.debug(f"🎯 Key pressed: {movement_key}, direction: {direction}")
+        movement_key = KEY_TO_MOVEMENT[event.key]
+        if movement_key in self.key_mappings:
+            mods = pygame.key.get_mods()
+            direction = 1 if mods & pygame.KMOD_SHIFT else -1
+            
+            # Convert movement key to face name
+            face = MOVEMENT_TO_FACE.get(movement_key, movement_key)
+            
+            # Use the cube's rotate_face method directly
+            cube.rotate_face(face, direction)
+            
+            logger.debug("🎯 Key pressed: %s, direction: %s", movement_key, direction)
     
     def _handle_mouse_motion(self, current_pos, cube):
         """
@@ -163,14 +250,14 @@ class Renderer:
             current_pos (tuple): Current mouse position
             cube (RubiksCube): The cube instance
         """
-        dx = current_pos[0] - self.last_mouse_pos[0]
-        dy = current_pos[1] - self.last_mouse_pos[1]
+        x, y = current_pos
+        last_x, last_y = self.last_mouse_pos
+        sensitivity = config.MOUSE_ROTATION_SENSITIVITY
         
-        cube.view_rot_y += dx * config.MOUSE_ROTATION_SENSITIVITY
-        cube.view_rot_x += dy * config.MOUSE_ROTATION_SENSITIVITY
-        
-        # Keep rotation within reasonable bounds
-        cube.view_rot_x = max(-90, min(90, cube.view_rot_x))
+        # Each view angle is read and written once; yaw wraps so it stays
+        # small over long drags, pitch is kept within reasonable bounds
+        cube.view_rot_y = (cube.view_rot_y + (x - last_x) * sensitivity) % 360
+        cube.view_rot_x = max(-90, min(90, cube.view_rot_x + (y - last_y) * sensitivity))
         
         self.last_mouse_pos = current_pos
     
@@ -185,10 +272,10 @@ class Renderer:
         # Calculate total distance moved from start position
         total_dx = current_pos[0] - self.face_rotation_start_pos[0]
         total_dy = current_pos[1] - self.face_rotation_start_pos[1]
-        total_distance = (total_dx**2 + total_dy**2)**0.5
+        total_distance_sq = total_dx * total_dx + total_dy * total_dy
         
-        # Check if we've moved enough to trigger rotation
-        if total_distance > self.face_rotation_threshold and not self.face_rotation_triggered:
+        # Check if we've moved enough to trigger rotation (compared squared, no square root)
+        if total_distance_sq > self.face_rotation_threshold_sq and not self.face_rotation_triggered:
             # Determine rotation direction based on dominant movement
             if abs(total_dx) > abs(total_dy):
                 # Horizontal movement dominates
@@ -203,9 +290,33 @@ class Renderer:
         
         self.last_mouse_pos = current_pos
     
+    def _create_pick_framebuffer(self, size):
+        """
+        Create the offscreen framebuffer used for color-ID picking.
+        
+        Args:
+            size (tuple): (width, height) of the window
+            
+        Returns:
+            int: OpenGL framebuffer name
+        """
+        framebuffer = glGenFramebuffers(1)
+        color_buffer, depth_buffer = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, color_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, size[0], size[1])
+        glBindRenderbuffer(GL_RENDERBUFFER, depth_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, size[0], size[1])
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color_buffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth_buffer)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        return framebuffer
+    
     def get_clicked_cubie_info(self, mouse_pos, cube):
         """
-        Get the cubie that was clicked using ray casting.
+        Get the cubie that was clicked using color-ID picking.
         
         Args:
             mouse_pos (tuple): (x, y) screen coordinates
@@ -214,75 +325,70 @@ class Renderer:
         Returns:
             tuple: (cubie, face) or None if no cubie clicked
         """
-        # Get viewport and modelview/projection matrices
-        viewport = glGetIntegerv(GL_VIEWPORT)
-        modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-        projection = glGetDoublev(GL_PROJECTION_MATRIX)
-        
         x, y = mouse_pos
-        y = viewport[3] - y  # Flip Y coordinate
-        
-        # Get the depth at the clicked pixel
-        z = glReadPixels(x, y, 1, 1, GL_DEPTH_COMPONENT, GL_FLOAT)[0][0]
+        y = self.viewport[3] - 1 - y  # Flip Y coordinate
         
-        # Unproject to get world coordinates
-        world_pos = gluUnProject(x, y, z, modelview, projection, viewport)
+        # Draw face ids offscreen and read back the one under the cursor;
+        # dithering is off so the id colors are written exactly
+        glBindFramebuffer(GL_FRAMEBUFFER, self.pick_framebuffer)
+        glDisable(GL_DITHER)
+        self._begin_scene(cube)
+        cube.draw_pick()
+        color = np.frombuffer(glReadPixels(x, y, 1, 1, GL_RGB, GL_UNSIGNED_BYTE), dtype=np.uint8)
+        glEnable(GL_DITHER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
         
-        if world_pos is None:
-            logger.warning("⚠️ Failed to unproject mouse coordinates")
-            return None
-        
-        logger.debug(f"Mouse click at screen ({mouse_pos[0]}, {mouse_pos[1]}) -> world: {world_pos}")
+        clicked = cube.decode_pick_color(color)
+        if clicked:
+            logger.debug("Mouse click at screen (%d, %d) -> cubie %d, face: %s", mouse_pos[0], mouse_pos[1], clicked[0].index, clicked[1])
+        else:
+            logger.debug("No sticker under screen (%d, %d)", mouse_pos[0], mouse_pos[1])
+        return clicked
+    
+    def _begin_scene(self, cube):
+        """
+        Clear the bound framebuffer and load the camera view.
         
-        # Find the closest cubie to the clicked world position
-        closest_cubie = None
-        closest_distance = float('inf')
-        closest_face = None
+        Args:
+            cube (RubiksCube): The cube whose view rotation is used
+        """
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glLoadMatrixf(cube.get_view_matrix().T)
+    
+    def _draw_scene(self, cube):
+        """
+        Draw the cube into the back buffer without presenting it.
         
-        for cubie in cube.cubies:
-            # Get cubie position in world coordinates
-            cubie_world_pos = np.dot(cubie.matrix[:3, :3], cubie.pos) + cubie.matrix[:3, 3]
-            
-            # Calculate distance from click to cubie center
-            distance = ((world_pos[0] - cubie_world_pos[0])**2 + 
-                       (world_pos[1] - cubie_world_pos[1])**2 + 
-                       (world_pos[2] - cubie_world_pos[2])**2)**0.5
-            
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_cubie = cubie
-                
-                # Determine which face was clicked based on normal direction
-                # This is a simplified approach - we'll use the face with the most visible color
-                visible_faces = [face for face, color in cubie.colors.items() 
-                               if color != config.COLORS['INSIDE']]
-                if visible_faces:
-                    closest_face = visible_faces[0]  # Take the first visible face
-        
-        # If we found a cubie within reasonable distance
-        if closest_distance < config.CUBIE_SIZE * 2 and closest_face:
-            logger.debug(f"Selected cubie at distance {closest_distance:.3f}, face: {closest_face}")
-            return (closest_cubie, closest_face)
-        else:
-            logger.debug(f"No cubie found within reasonable distance. Closest: {closest_distance:.3f}")
-            return None
+        Args:
+            cube (RubiksCube): The cube to draw
+        """
+        self._begin_scene(cube)
+        cube.draw()
     
     def render_frame(self, cube):
         """
-        Render a single frame.
+        Render a single frame if the scene changed since the last one.
         
         Args:
             cube (RubiksCube): The cube to render
         """
-        cube.draw()
+        if not self.needs_redraw and not cube.is_animating:
+            return
+        
+        self._draw_scene(cube)
         pygame.display.flip()
+        self.needs_redraw = False
     
     def tick(self, fps=60):
         """
         Limit frame rate.
         
+        The cap also applies with vsync: animation speed is counted in frames,
+        so faster displays must not turn faces faster, and drivers that ignore
+        the swap interval must not leave the loop spinning.
+        
         Args:
-            fps (int): Target frames per second
+            fps (int): Maximum frames per second
         """
         self.clock.tick(fps)
     
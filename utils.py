@@ -3,7 +3,9 @@ Utility functions and classes for the Rubik's Cube application.
 """
 
 import logging
+import math
 import sys
+import numpy as np
 
 class CubeLogger:
     """Custom logger for the Rubik's Cube application."""
@@ -18,14 +20,14 @@ class CubeLogger:
         """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
-        self.debug_enabled = False
+        self.debug_enabled = level <= logging.DEBUG
         
         # Clear existing handlers
         self.logger.handlers.clear()
         
-        # Create console handler
+        # Create console handler; it passes every record through, so the
+        # logger level alone decides what is emitted
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level)
         
         # Create formatter without timestamp
         formatter = logging.Formatter('%(levelname)s - %(message)s')
@@ -33,47 +35,59 @@ class CubeLogger:
         
         # Add handler to logger
         self.logger.addHandler(console_handler)
-        
-        # Ensure handler level matches logger level
-        for handler in self.logger.handlers:
-            handler.setLevel(level)
     
     def toggle_debug(self):
         """Toggle debug mode on/off."""
         self.debug_enabled = not self.debug_enabled
         if self.debug_enabled:
             self.logger.setLevel(logging.DEBUG)
-            # Also update the handler level
-            for handler in self.logger.handlers:
-                handler.setLevel(logging.DEBUG)
             self.info("🐛 Debug mode enabled")
         else:
             self.logger.setLevel(logging.INFO)
-            # Also update the handler level
-            for handler in self.logger.handlers:
-                handler.setLevel(logging.INFO)
             self.info("🐛 Debug mode disabled")
     
-    def debug(self, message):
+    # Messages take %-style args so that records below the logger level are
+    # dropped before any formatting happens
+    def debug(self, message, *args, **kwargs):
         """Log debug message."""
-        if self.debug_enabled:
-            self.logger.debug(message)
+        self.logger.debug(message, *args, **kwargs)
     
-    def info(self, message):
+    def info(self, message, *args, **kwargs):
         """Log info message."""
-        self.logger.info(message)
+        self.logger.info(message, *args, **kwargs)
     
-    def warning(self, message):
+    def warning(self, message, *args, **kwargs):
         """Log warning message."""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message):
+    def error(self, message, *args, **kwargs):
         """Log error message."""
-        self.logger.error(message)
+        self.logger.error(message, *args, **kwargs)
     
-    def critical(self, message):
+    def critical(self, message, *args, **kwargs):
         """Log critical message."""
-        self.logger.critical(message)
+        self.logger.critical(message, *args, **kwargs)
+
+def perspective_matrix(fov, aspect, near, far):
+    """
+    Build a perspective projection matrix, as gluPerspective would.
+    
+    Args:
+        fov (float): Vertical field of view in degrees
+        aspect (float): Viewport width divided by height
+        near (float): Distance to the near clipping plane
+        far (float): Distance to the far clipping plane
+        
+    Returns:
+        numpy.ndarray: 4x4 projection matrix
+    """
+    f = 1.0 / math.tan(math.radians(fov) / 2.0)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0]
+    ])
 
 # Global logger instance
 logger = CubeLogger() 
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+VertexBuffer class wrapping an OpenGL buffer of interleaved vertices.
+"""
+
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+# Interleaved vertex layout: float32 position, normalized byte normal and
+# unsigned byte RGBA color, 20 bytes per vertex
+VERTEX_DTYPE = np.dtype({
+    'names': ['position', 'normal', 'color'],
+    'formats': [(np.float32, 3), (np.int8, 3), (np.uint8, 4)],
+    'offsets': [0, 12, 16],
+    'itemsize': 20,
+})
+
+def pack_vertices(positions, normals, colors):
+    """
+    Pack vertex attributes into the VERTEX_DTYPE layout.
+    
+    Normals are quantized to bytes and colors to 8 bits per channel; OpenGL
+    maps both back to floats when the vertices are fetched.
+    
+    Args:
+        positions (numpy.ndarray): (..., 3) vertex positions
+        normals (numpy.ndarray): Unit normals, broadcastable to positions
+        colors (numpy.ndarray): RGB colors in [0, 1], broadcastable to positions
+        
+    Returns:
+        numpy.ndarray: Flat array of VERTEX_DTYPE vertices
+    """
+    vertices = np.empty(positions.shape[:-1], dtype=VERTEX_DTYPE)
+    vertices['position'] = positions
+    vertices['normal'] = np.round(np.broadcast_to(normals, positions.shape) * 127)
+    vertices['color'][..., :3] = np.round(np.broadcast_to(colors, positions.shape) * 255)
+    vertices['color'][..., 3] = 255
+    return vertices.reshape(-1)
+
+def enable_vertex_arrays():
+    """Enable the client arrays read by VertexBuffer.draw."""
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_NORMAL_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+
+class VertexBuffer:
+    """Holds interleaved VERTEX_DTYPE vertices in GPU memory."""
+
+    def __init__(self, usage=GL_STATIC_DRAW):
+        """
+        Initialize the vertex buffer.
+        
+        The OpenGL buffer itself is created on the first upload, once a
+        context is guaranteed to exist.
+        
+        Args:
+            usage: OpenGL usage hint (GL_STATIC_DRAW for geometry that is kept
+                over many frames, GL_STREAM_DRAW for geometry rebuilt every frame)
+        """
+        self.usage = usage
+        self.vbo = None
+        self.ibo = None
+        self.count = 0
+        self.index_count = 0
+    
+    def upload(self, vertices, indices=None):
+        """
+        Replace the contents of the buffer.
+        
+        Args:
+            vertices (numpy.ndarray): Flat array of VERTEX_DTYPE vertices
+            indices (numpy.ndarray): Optional vertex indices; when given, draws
+                go through glDrawElements so shared vertices are stored once
+        """
+        # PyOpenGL hands contiguous arrays of the right type straight to the
+        # driver; anything else would be copied and converted on every call
+        vertices = np.ascontiguousarray(vertices, dtype=VERTEX_DTYPE)
+        if self.vbo is None:
+            self.vbo = glGenBuffers(1)
+        
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, self.usage)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.count = len(vertices)
+        
+        if indices is None:
+            self.index_count = 0
+            return
+        
+        indices = np.ascontiguousarray(indices, dtype=np.uint32)
+        if self.ibo is None:
+            self.ibo = glGenBuffers(1)
+        
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, self.usage)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self.index_count = len(indices)
+    
+    def clear(self):
+        """Mark the buffer as empty without releasing it."""
+        self.count = 0
+        self.index_count = 0
+    
+    def draw(self, mode):
+        """
+        Draw the uploaded vertices.
+        
+        The vertex, normal and color client arrays must be enabled; they are
+        switched on once for the whole program by enable_vertex_arrays.
+        
+        Args:
+            mode: OpenGL primitive type
+        """
+        if self.count == 0:
+            return
+        
+        stride = VERTEX_DTYPE.itemsize
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glVertexPointer(3, GL_FLOAT, stride, ctypes.c_void_p(0))
+        glNormalPointer(GL_BYTE, stride, ctypes.c_void_p(VERTEX_DTYPE.fields['normal'][1]))
+        glColorPointer(4, GL_UNSIGNED_BYTE, stride, ctypes.c_void_p(VERTEX_DTYPE.fields['color'][1]))
+        
+        if self.index_count:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glDrawElements(mode, self.index_count, GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            glDrawArrays(mode, 0, self.count)
+        
+        glBindBuffer(GL_ARRAY_BUFFER, 0)